@@ -0,0 +1,288 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import pydeck as pdk
+
+DATA_PATH = "data_airbnb.csv"
+# Per-filter caches are shared by all sessions; keep only the most recent
+# filter combinations so slider dragging can't grow memory without bound
+FILTER_CACHE_ENTRIES = 32
+HEXBIN_MIN_POINTS = 1_000  # below this, plain st.map points are cheap enough
+MAP_MAX_POINTS = 10_000  # cap on rows shipped to the browser for the map
+
+# Fixed chart settings shared by every build; only the data changes per
+# filter. Plotly still copies and validates the layout for each new figure.
+PRICE_HIST_LAYOUT = {
+    "title": "Distribution of Listing Prices",
+    "xaxis_title": "price",
+    "yaxis_title": "count",
+    "bargap": 0,
+}
+MAP_VIEW_STATE = pdk.ViewState(latitude=40.75, longitude=-73.98, zoom=10, pitch=40)
+MAP_TOOLTIP_LINES = {
+    "name": "{name}",
+    "price": "Price: ${price}",
+    "beds": "Beds: {beds}",
+    "room_type": "Room Type: {room_type}",
+    "neighbourhood": "Neighbourhood: {neighbourhood}",
+}
+MAP_PRICE_COLORS = np.array(
+    [px.colors.hex_to_rgb(c) for c in px.colors.sequential.Viridis]
+)
+
+
+# Load data. cache_resource hands every rerun and session the same frame
+# instead of unpickling a fresh copy, so callers must treat it as read-only.
+# mtime is part of the cache key, so editing the CSV triggers a re-parse.
+@st.cache_resource(max_entries=1)
+def load_data(path, mtime):
+    df = pd.read_csv(path, engine="pyarrow")
+    # Low-cardinality strings: isin/value_counts/groupby work on integer codes
+    for col in ("room_type", "neighbourhood_group", "neighbourhood", "host_name"):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    # Downcast numerics to shrink the shared frame; coordinates stay float64,
+    # as pydeck would write float32 values back out as longer float64 reprs
+    downcasts = {
+        "price": "float32",
+        "beds": "Int8",
+        "number_of_reviews": "Int32",
+        "reviews_per_month": "float32",
+    }
+    for col, dtype in downcasts.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    # "No rating" becomes NaN here, once per load
+    if "rating" in df.columns:
+        df["rating"] = pd.to_numeric(df["rating"], errors="coerce").astype("float32")
+    return df
+
+
+# Valid filters (independent of the sidebar selections, so cached too)
+@st.cache_data(max_entries=1)
+def filter_domain(path, mtime):
+    df = load_data(path, mtime)
+    room_types = (
+        df["room_type"].dropna().unique().tolist() if "room_type" in df.columns else []
+    )
+    min_price = int(df["price"].min()) if "price" in df.columns else 0
+    max_price = int(df["price"].max()) if "price" in df.columns else 1000
+    neighbourhood_groups = (
+        df["neighbourhood_group"].dropna().unique().tolist()
+        if "neighbourhood_group" in df.columns
+        else []
+    )
+    return room_types, min_price, max_price, neighbourhood_groups
+
+
+def apply_filters(df, room_types, price_range, neighbourhood_groups):
+    # One combined mask, one copy
+    mask = np.ones(len(df), dtype=bool)
+    if "room_type" in df.columns:
+        mask &= df["room_type"].isin(room_types).to_numpy()
+    if "price" in df.columns:
+        price = df["price"].to_numpy()
+        mask &= price >= price_range[0]
+        mask &= price <= price_range[1]
+    if "neighbourhood_group" in df.columns:
+        mask &= df["neighbourhood_group"].isin(neighbourhood_groups).to_numpy()
+    return df.loc[mask].reset_index(drop=True)
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def kpi_stats(_df, filters):
+    # Plain NumPy reductions on the raw columns, cached per filter like the
+    # figures below; None marks a column the data doesn't have, NaN an empty
+    # selection
+    means = {}
+    for col in ("price", "rating"):
+        if col in _df.columns:
+            values = _df[col].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            means[col] = float(values.mean()) if values.size else float("nan")
+    return len(_df), means.get("price"), means.get("rating")
+
+
+# Figure builders. Each is keyed on the hashable filter tuple only (the
+# leading underscore keeps Streamlit from hashing the frame), so revisiting a
+# filter combination, e.g. dragging a slider back, skips the rebuild.
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_price_hist(_df, filters):
+    # Bin server-side so the figure carries 50 bars rather than every price
+    price = _df["price"].to_numpy(dtype=float)
+    counts, edges = np.histogram(price[~np.isnan(price)], bins=50)
+    return go.Figure(
+        go.Bar(
+            x=0.5 * (edges[:-1] + edges[1:]),
+            y=counts,
+            width=np.diff(edges),
+            marker_color="#FF5A5F",
+        ),
+        layout=PRICE_HIST_LAYOUT,
+    )
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def room_type_stats(_df, filters):
+    # One factorize pass over room_type feeds both the pie and the rating bar;
+    # only observed room types get a code, so unselected categories drop out
+    codes, uniques = pd.factorize(_df["room_type"])
+    valid = codes >= 0
+    codes = codes[valid]
+    n = len(uniques)
+    stats = pd.DataFrame(
+        {
+            "room_type": np.asarray(uniques),
+            "count": np.bincount(codes, minlength=n),
+        }
+    )
+    if "rating" in _df.columns:
+        rating = _df["rating"].to_numpy(dtype=float)[valid]
+        rated = ~np.isnan(rating)
+        sums = np.bincount(codes, weights=np.where(rated, rating, 0.0), minlength=n)
+        counts = np.bincount(codes, weights=rated, minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats["avg_rating"] = sums / counts
+    return stats
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_room_pie(_df, filters):
+    room_counts = room_type_stats(_df, filters).sort_values("count", ascending=False)
+    return px.pie(
+        values=room_counts["count"],
+        names=room_counts["room_type"],
+        title="Room Type Proportion",
+        color_discrete_sequence=px.colors.sequential.RdBu,
+    )
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_top_hosts(_df, filters):
+    # host_name is categorical: count its integer codes with one bincount.
+    # Only hosts at or above the 10th-largest count can make the list; those
+    # are ranked by count, ties in first-seen order as value_counts() did on
+    # the raw column (pd.unique hashes, so no sort over every listing).
+    hosts = _df["host_name"].cat
+    codes = hosts.codes.to_numpy()
+    codes = codes[codes >= 0]
+    counts = np.bincount(codes, minlength=len(hosts.categories))
+    top = codes[:0]
+    if codes.size:
+        cutoff = max(np.partition(counts, -10)[-10] if counts.size > 10 else 1, 1)
+        candidates = pd.unique(codes[counts[codes] >= cutoff])
+        top = candidates[np.argsort(-counts[candidates], kind="stable")[:10]]
+    top_hosts = pd.DataFrame(
+        {"host_name": hosts.categories[top], "num_listings": counts[top]}
+    )
+    return px.bar(
+        top_hosts,
+        x="host_name",
+        y="num_listings",
+        labels={"host_name": "Host Name", "num_listings": "Number of Listings"},
+        title="Top 10 Hosts",
+        color_discrete_sequence=["#00A699"],
+    )
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_avg_rating(_df, filters):
+    avg_rating = room_type_stats(_df, filters)[["room_type", "avg_rating"]]
+    avg_rating = avg_rating[avg_rating["avg_rating"].notnull()]  # Remove NaN ratings
+    avg_rating = avg_rating.sort_values(by="avg_rating", ascending=False).reset_index(
+        drop=True
+    )
+    return px.bar(
+        avg_rating,
+        x="room_type",
+        y="avg_rating",
+        labels={"room_type": "Room Type", "avg_rating": "Average Rating"},
+        title="Average Rating per Room Type",
+        color_discrete_sequence=["#007A87"],
+    )
+
+
+def sample_for_map(df, n):
+    # 1-in-k sample per borough so the map keeps its spatial balance; each
+    # kept row stands for k listings, carried in a weight column
+    k = -(-len(df) // n)
+    if "neighbourhood_group" in df.columns:
+        df = df.groupby("neighbourhood_group", observed=True, group_keys=False)
+    return df.sample(frac=1 / k, random_state=0).assign(weight=k)
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_map(_df, filters):
+    # Hexbin aggregation runs GPU-side in deck.gl, so the browser draws one
+    # column per occupied cell instead of one marker per listing
+    data = _df[["longitude", "latitude"]]
+    weighting = {}
+    tooltip = "{elevationValue} listings"
+    if len(_df) > MAP_MAX_POINTS:
+        # Bound the payload; summing the sample weights keeps hex totals in
+        # listings rather than sampled rows
+        data = sample_for_map(_df, MAP_MAX_POINTS)[["longitude", "latitude", "weight"]]
+        weighting = {
+            "get_elevation_weight": "weight",
+            "elevation_aggregation": '"SUM"',
+            "get_color_weight": "weight",
+            "color_aggregation": '"SUM"',
+        }
+        tooltip = "≈{elevationValue} listings"
+    layer = pdk.Layer(
+        "HexagonLayer",
+        data=data,
+        get_position="[longitude, latitude]",
+        radius=100,
+        elevation_scale=4,
+        elevation_range=[0, 1000],
+        extruded=True,
+        pickable=True,
+        **weighting,
+    )
+    return pdk.Deck(
+        map_style=None,
+        initial_view_state=MAP_VIEW_STATE,
+        layers=[layer],
+        tooltip={"text": tooltip},
+    )
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES)
+def build_point_map(_df, filters):
+    # Per-listing markers for small frames. Colour and radius are derived from
+    # price here, so the browser gets plain RGB/radius columns rather than a
+    # Plotly figure carrying a hover dict for every point.
+    hover_cols = [
+        c for c in ("name", "room_type", "neighbourhood", "beds") if c in _df.columns
+    ]
+    data = _df[["longitude", "latitude", "price"] + hover_cols].copy()
+    for col in hover_cols:
+        data[col] = data[col].astype(str)
+    price = data["price"].to_numpy(dtype=float)
+    span = price.max() - price.min()
+    norm = (price - price.min()) / span if span else np.zeros_like(price)
+    idx = np.rint(norm * (len(MAP_PRICE_COLORS) - 1)).astype(int)
+    data["color"] = MAP_PRICE_COLORS[idx].tolist()
+    data["radius"] = 20 + 80 * norm
+    layer = pdk.Layer(
+        "ScatterplotLayer",
+        data=data,
+        get_position="[longitude, latitude]",
+        get_fill_color="color",
+        get_radius="radius",
+        radius_min_pixels=2,
+        radius_max_pixels=10,
+        pickable=True,
+    )
+    tooltip = "\n".join(
+        line for col, line in MAP_TOOLTIP_LINES.items() if col in data.columns
+    )
+    return pdk.Deck(
+        map_style=None,
+        initial_view_state=MAP_VIEW_STATE,
+        layers=[layer],
+        tooltip={"text": tooltip},
+    )
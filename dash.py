@@ -1,28 +1,36 @@
+import os
+
 import streamlit as st
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-import plotly.express as px
+
+from common import (
+    DATA_PATH,
+    HEXBIN_MIN_POINTS,
+    apply_filters,
+    build_avg_rating,
+    build_map,
+    build_point_map,
+    build_price_hist,
+    build_room_pie,
+    build_top_hosts,
+    filter_domain,
+    kpi_stats,
+    load_data,
+)
 
 # Set Streamlit page config
 st.set_page_config(page_title="New York Airbnb Dashboard 🏡", layout="wide")
 
 # Load data
-df = pd.read_csv("data_airbnb.csv")
+data_mtime = os.path.getmtime(DATA_PATH)
+df = load_data(DATA_PATH, data_mtime)
 
 # Sidebar filters
 st.sidebar.header("🔍 Filter Listings")
 
-# Valid filters
-room_types = (
-    df["room_type"].dropna().unique().tolist() if "room_type" in df.columns else []
-)
-min_price = int(df["price"].min()) if "price" in df.columns else 0
-max_price = int(df["price"].max()) if "price" in df.columns else 1000
-neighbourhood_groups = (
-    df["neighbourhood_group"].dropna().unique().tolist()
-    if "neighbourhood_group" in df.columns
-    else []
+room_types, min_price, max_price, neighbourhood_groups = filter_domain(
+    DATA_PATH, data_mtime
 )
 
 st.markdown(
@@ -60,12 +68,14 @@ selected_price = st.sidebar.slider(
 )
 
 # Filter dataset
-if "room_type" in df.columns:
-    df = df[df["room_type"].isin(selected_room_type)]
-if "price" in df.columns:
-    df = df[(df["price"] >= selected_price[0]) & (df["price"] <= selected_price[1])]
-if "neighbourhood_group" in df.columns:
-    df = df[df["neighbourhood_group"].isin(selected_neighbourhood_group)]
+df = apply_filters(df, selected_room_type, selected_price, selected_neighbourhood_group)
+filters = (
+    DATA_PATH,
+    data_mtime,
+    tuple(selected_room_type),
+    tuple(selected_price),
+    tuple(selected_neighbourhood_group),
+)
 
 st.markdown(
     """
@@ -79,114 +89,57 @@ st.markdown(
 
 # KPIs
 st.markdown("### 📊 Key Metrics")
+total_listings, avg_price, avg_rating = kpi_stats(df, filters)
 col1, col2, col3 = st.columns(3)
-col1.metric("🔢 Total Listings", len(df))
+col1.metric("🔢 Total Listings", total_listings)
 col2.metric(
-    "💰 Average Price", f"${df['price'].mean():.2f}" if "price" in df.columns else "N/A"
+    "💰 Average Price", f"${avg_price:.2f}" if avg_price is not None else "N/A"
 )
 col3.metric(
-    "⭐ Average Rating",
-    f"{pd.to_numeric(df['rating'], errors='coerce').mean():.2f}"
-    if "rating" in df.columns
-    else "N/A",
+    "⭐ Average Rating", f"{avg_rating:.2f}" if avg_rating is not None else "N/A"
 )
 
 # Price Distribution
 if "price" in df.columns:
     st.markdown("### 💵 Price Distribution")
-    fig_price = px.histogram(
-        df,
-        x="price",
-        nbins=50,
-        title="Distribution of Listing Prices",
-        color_discrete_sequence=["#FF5A5F"],
-    )
+    fig_price = build_price_hist(df, filters)
     st.plotly_chart(fig_price, use_container_width=True)
 
 # Listings by Room Type
 if "room_type" in df.columns:
     st.markdown("### 🛏️ Listings by Room Type")
-    room_counts = df["room_type"].value_counts()
-    fig_room = px.pie(
-        values=room_counts.values,
-        names=room_counts.index,
-        title="Room Type Proportion",
-        color_discrete_sequence=px.colors.sequential.RdBu,
-    )
+    fig_room = build_room_pie(df, filters)
     st.plotly_chart(fig_room)
 
 # Top 10 Hosts (if available)
 if "host_name" in df.columns:
     st.markdown("### 👤 Top 10 Hosts by Number of Listings")
-    top_hosts = df["host_name"].value_counts().head(10).reset_index()
-    top_hosts.columns = ["host_name", "num_listings"]
-    fig_hosts = px.bar(
-        top_hosts,
-        x="host_name",
-        y="num_listings",
-        labels={"host_name": "Host Name", "num_listings": "Number of Listings"},
-        title="Top 10 Hosts",
-        color_discrete_sequence=["#00A699"],
-    )
+    fig_hosts = build_top_hosts(df, filters)
     st.plotly_chart(fig_hosts)
 
 # Average Ratings per Room Type (alternative to cities)
 if "room_type" in df.columns and "rating" in df.columns:
     st.markdown("### ⭐ Average Ratings by Room Type")
-
-    # Convert rating to numeric first
-    df["rating"] = pd.to_numeric(df["rating"], errors="coerce")
-
-    avg_rating = (
-        df.groupby("room_type")["rating"]
-        .mean()
-        .sort_values(ascending=False)
-        .reset_index()
-    )
-    avg_rating.columns = ["room_type", "avg_rating"]
-    avg_rating = avg_rating[avg_rating["avg_rating"].notnull()]  # Remove NaN ratings
-    avg_rating = avg_rating.sort_values(by="avg_rating", ascending=False).reset_index(
-        drop=True
-    )
-    avg_rating.columns = ["room_type", "avg_rating"]
-    fig_rating = px.bar(
-        avg_rating,
-        x="room_type",
-        y="avg_rating",
-        labels={"room_type": "Room Type", "avg_rating": "Average Rating"},
-        title="Average Rating per Room Type",
-        color_discrete_sequence=["#007A87"],
-    )
+    fig_rating = build_avg_rating(df, filters)
     st.plotly_chart(fig_rating)
 
 # Map visualization
 if "latitude" in df.columns and "longitude" in df.columns:
     st.markdown("### 🗺️ Map of Listings")
-    if not df[["latitude", "longitude"]].dropna().empty:
-        map_fig = px.scatter_map(
-            df.dropna(subset=["latitude", "longitude"]),
-            lat="latitude",
-            lon="longitude",
-            color="price" if "price" in df.columns else None,
-            size="price" if "price" in df.columns else None,
-            hover_name="name" if "name" in df.columns else None,
-            hover_data={
-                "price": True if "price" in df.columns else False,
-                "beds": True if "beds" in df.columns else False,
-                "room_type": True if "room_type" in df.columns else False,
-                "neighbourhood": True if "neighbourhood" in df.columns else False,
-            },
-            color_continuous_scale=px.colors.sequential.Viridis,
-            size_max=10,
+    map_df = df.dropna(subset=["latitude", "longitude"])
+    if map_df.empty:
+        st.info("No map data available for the selected filters.")
+    elif len(map_df) < HEXBIN_MIN_POINTS and "price" in map_df.columns:
+        st.pydeck_chart(build_point_map(map_df, filters), width="stretch")
+    elif len(map_df) < HEXBIN_MIN_POINTS:
+        st.map(
+            map_df[["latitude", "longitude"]],
+            latitude="latitude",
+            longitude="longitude",
             zoom=10,
-            height=500,
         )
-        map_fig.update_layout(
-            mapbox_style="carto-positron", margin={"r": 0, "t": 0, "l": 0, "b": 0}
-        )
-        st.plotly_chart(map_fig, use_container_width=True)
     else:
-        st.info("No map data available for the selected filters.")
+        st.pydeck_chart(build_map(map_df, filters), width="stretch")
 
 # Footer
 st.markdown(